@@ -0,0 +1,7 @@
+# Make sure the Celery app is loaded when Django starts so that
+# @shared_task binds to it.
+from .celery import app as celery_app
+# Connects the connection pool metrics to request_finished
+from . import db  # noqa: F401
+
+__all__ = ('celery_app',)
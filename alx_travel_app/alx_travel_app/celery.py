@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from celery.signals import task_prerun, task_postrun
 
 # Set the default Django settings module
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'alx_travel_app.settings')
@@ -13,6 +14,22 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Auto-discover tasks in all installed apps
 app.autodiscover_tasks()
 
+@task_prerun.connect
+@task_postrun.connect
+def close_old_db_connections(task=None, **kwargs):
+    # What Django does around each request: drop connections that are broken
+    # or older than CONN_MAX_AGE, and hand pooled ones back to the pool.
+    # Eager tasks run inside the caller's request and transaction.
+    if task is not None and getattr(task.request, 'is_eager', False):
+        return
+    from django.db import close_old_connections
+    close_old_connections()
+
+@task_postrun.connect
+def report_db_pool_stats(**kwargs):
+    from alx_travel_app.db import report_pool_stats
+    report_pool_stats()
+
 @app.task(bind=True)
 def debug_task(self):
     print(f'Request: {self.request!r}') 
\ No newline at end of file
@@ -0,0 +1,60 @@
+# alx_travel_app/db.py
+
+import logging
+import time
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import connections
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+_last_report = 0.0
+
+
+def pool_stats(alias='default'):
+    """
+    Statistics for the connection pool of ``alias`` since the last call, or
+    None when DB_POOL_MODE is not 'pool'.
+
+    Adds ``saturation`` (share of the maximum pool size in use) and
+    ``avg_wait_ms`` (mean time a request waited for a connection) to the
+    counters reported by psycopg_pool.
+    """
+    pool = getattr(connections[alias], 'pool', None)
+    if pool is None:
+        return None
+
+    stats = pool.pop_stats()
+    in_use = stats.get('pool_size', 0) - stats.get('pool_available', 0)
+    stats['saturation'] = in_use / stats['pool_max'] if stats.get('pool_max') else 0.0
+    requests_num = stats.get('requests_num', 0)
+    stats['avg_wait_ms'] = stats.get('requests_wait_ms', 0) / requests_num if requests_num else 0.0
+    return stats
+
+
+@receiver(request_finished, dispatch_uid='report_pool_stats')
+def report_pool_stats(**kwargs):
+    """
+    Log pool statistics at most once every DB_POOL_METRICS_INTERVAL seconds.
+    Connected to request_finished here and to task_postrun in
+    alx_travel_app.celery.
+    """
+    global _last_report
+
+    now = time.monotonic()
+    if now - _last_report < settings.DB_POOL_METRICS_INTERVAL:
+        return
+    _last_report = now
+
+    stats = pool_stats()
+    if stats is None:
+        return
+    logger.info(
+        f"DB pool ({settings.PROCESS_ROLE}): size={stats.get('pool_size', 0)}/{stats.get('pool_max', 0)} "
+        f"available={stats.get('pool_available', 0)} waiting={stats.get('requests_waiting', 0)} "
+        f"saturation={stats['saturation']:.0%} avg_wait_ms={stats['avg_wait_ms']:.1f} "
+        f"timeouts={stats.get('requests_errors', 0)}",
+        extra={'db_pool': stats},
+    )
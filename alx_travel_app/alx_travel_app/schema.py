@@ -0,0 +1,75 @@
+# alx_travel_app/schema.py
+
+import functools
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework import permissions
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+from drf_yasg.generators import OpenAPISchemaGenerator
+from drf_yasg.views import get_schema_view
+from drf_yasg import openapi
+
+API_INFO = openapi.Info(
+   title="ALX Travel API",
+   default_version='v1',
+   description="API documentation for ALX Travel Application",
+   terms_of_service="https://www.yourapp.com/terms/",
+   contact=openapi.Contact(email="contact@alxtravel.local"),
+   license=openapi.License(name="BSD License"),
+)
+
+SCHEMA_CODECS = {
+    'json': OpenAPICodecJson,
+    'yaml': OpenAPICodecYaml,
+}
+
+schema_view = get_schema_view(
+   API_INFO,
+   public=True,
+   permission_classes=[permissions.AllowAny],
+)
+
+
+def schema_path(extension, version):
+    return Path(settings.OPENAPI_SCHEMA_DIR) / f'schema-{version}.{extension}'
+
+
+def build_schema(extension):
+    """Generate the full schema and encode it the same way the spec views do."""
+    schema = OpenAPISchemaGenerator(API_INFO).get_schema(request=None, public=True)
+    return SCHEMA_CODECS[extension](validators=[]).encode(schema)
+
+
+@functools.lru_cache(maxsize=None)
+def get_schema(extension, version):
+    """
+    Encoded schema for ``version``: read from the file written by the
+    ``generate_schema`` command if it exists, otherwise generated once and
+    kept in memory for the life of the process.
+
+    Prebuilt files are ignored when no APP_VERSION is set or DEBUG is on, so
+    a stale file can't hide API changes during development.
+    """
+    if version and not settings.DEBUG:
+        path = schema_path(extension, version)
+        if path.exists():
+            return path.read_bytes()
+    return build_schema(extension)
+
+
+class CachedSchemaView(schema_view):
+    def get(self, request, version='', format=None):
+        # The UI pages render with an empty pattern list and are cheap; only
+        # the spec itself is served from the cache.
+        renderer = request.accepted_renderer
+        codec_class = getattr(renderer, 'codec_class', None)
+        if codec_class is None:
+            return super().get(request, version, format)
+
+        extension = 'yaml' if codec_class is OpenAPICodecYaml else 'json'
+        return HttpResponse(
+            get_schema(extension, settings.APP_VERSION),
+            content_type=renderer.media_type,
+        )
@@ -1,6 +1,10 @@
 import os
+import sys
 from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
 import environ  # Use django-environ
+from celery.schedules import crontab
+from kombu import Queue
 
 # Build paths inside the project
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -86,11 +90,66 @@ DATABASES = {
         'HOST': env('DB_HOST'),
         'PORT': env('DB_PORT'),
         'OPTIONS': {
-            'sslmode': 'require',
+            'sslmode': env('DB_SSLMODE', default='require'),
         }
     }
 }
 
+# Database connection reuse:
+#   'none'       - a new connection for every request/task
+#   'persistent' - keep connections open for DB_CONN_MAX_AGE seconds, checked
+#                  for health before reuse
+#   'pool'       - psycopg 3 connection pool (requires `psycopg[pool]`), sized
+#                  separately for web and Celery processes
+DB_POOL_MODE = env('DB_POOL_MODE', default='persistent')
+# 'web' or 'celery'; picks the pool size below. Detected from the `celery`
+# command or `python -m celery`, set PROCESS_ROLE explicitly for anything else.
+_entry_point = Path(sys.argv[0])
+PROCESS_ROLE = env('PROCESS_ROLE', default=(
+    'celery' if 'celery' in (_entry_point.name, _entry_point.parent.name) else 'web'
+))
+DB_POOL_SIZES = {
+    'web': (env.int('DB_POOL_MIN_SIZE', default=2), env.int('DB_POOL_MAX_SIZE', default=10)),
+    # Per worker process: each prefork child holds its own pool
+    'celery': (env.int('CELERY_DB_POOL_MIN_SIZE', default=1), env.int('CELERY_DB_POOL_MAX_SIZE', default=2)),
+}
+if PROCESS_ROLE not in DB_POOL_SIZES:
+    raise ImproperlyConfigured(f"Unknown PROCESS_ROLE: {PROCESS_ROLE}")
+# Seconds between pool statistics log lines (see alx_travel_app.db)
+DB_POOL_METRICS_INTERVAL = env.int('DB_POOL_METRICS_INTERVAL', default=60)
+
+if DB_POOL_MODE == 'persistent':
+    DATABASES['default']['CONN_MAX_AGE'] = env.int('DB_CONN_MAX_AGE', default=600)
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+elif DB_POOL_MODE == 'pool':
+    min_size, max_size = DB_POOL_SIZES[PROCESS_ROLE]
+    # Health checks make the pool test each connection before handing it out
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': min_size,
+        'max_size': max_size,
+        'timeout': env.float('DB_POOL_TIMEOUT', default=10),
+    }
+elif DB_POOL_MODE != 'none':
+    raise ImproperlyConfigured(f"Unknown DB_POOL_MODE: {DB_POOL_MODE}")
+
+# Without a handler, Python only prints WARNING and above, which would drop
+# the pool metrics logged by alx_travel_app.db at INFO
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'alx_travel_app.db': {
+            'handlers': ['console'],
+            'level': env('DB_POOL_LOG_LEVEL', default='INFO'),
+            'propagate': False,
+        },
+    },
+}
+
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = True
 
@@ -99,15 +158,69 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'rest_framework.schemas.coreapi.AutoSchema',
 }
 
+# Code version (e.g. the git commit) of this deployment; keys the prebuilt API
+# schema. Leave unset in development so the schema always reflects the code.
+APP_VERSION = env('APP_VERSION', default=None)
+# Output of `python manage.py generate_schema`
+OPENAPI_SCHEMA_DIR = env('OPENAPI_SCHEMA_DIR', default=os.path.join(BASE_DIR, 'openapi'))
+
 STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Celery Configuration
 CELERY_BROKER_URL = env('CELERY_BROKER_URL', default='amqp://localhost')  # Ideally set in .env
-CELERY_RESULT_BACKEND = 'rpc://'
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
-CELERY_RESULT_SERIALIZER = 'json'
+
+# Nobody reads task results, so no result backend is configured. A task that
+# needs one must set CELERY_RESULT_BACKEND and opt in with ignore_result=False.
+CELERY_TASK_IGNORE_RESULT = True
+
+# Separate queues so payment work is never stuck behind email bursts or batch jobs.
+# Run one worker pool per queue, e.g. `celery -A alx_travel_app worker -Q payments`.
+CELERY_TASK_DEFAULT_QUEUE = 'default'
+CELERY_TASK_QUEUES = (
+    Queue('default', routing_key='default'),
+    Queue('payments', routing_key='payments'),
+    Queue('notifications', routing_key='notifications'),
+    Queue('batch', routing_key='batch'),
+)
+CELERY_TASK_ROUTES = {
+    'listings.tasks.*payment*': {'queue': 'payments'},
+    'listings.tasks.send_*': {'queue': 'notifications'},
+    'listings.tasks.batch_*': {'queue': 'batch'},
+}
+
+# Celery's Django fixup closes every database connection (and, under prefork,
+# the whole pool) around each task unless DB reuse is set. When connections
+# are reused, only do that full reset every CELERY_DB_REUSE_MAX tasks;
+# alx_travel_app.celery applies CONN_MAX_AGE and health checks per task instead.
+if DB_POOL_MODE != 'none':
+    CELERY_DB_REUSE_MAX = env.int('CELERY_DB_REUSE_MAX', default=1000)
+
+# Tasks are acked late, so only reserve one message per worker process at a time
+CELERY_WORKER_PREFETCH_MULTIPLIER = env.int('CELERY_WORKER_PREFETCH_MULTIPLIER', default=1)
+
+# Periodic tasks, run with `celery -A alx_travel_app beat`
+CELERY_BEAT_SCHEDULE = {
+    'archive-booking-history': {
+        'task': 'listings.tasks.batch_archive_history',
+        'schedule': crontab(hour=3, minute=0),
+    },
+    'purge-outbox': {
+        'task': 'listings.tasks.batch_purge_outbox',
+        'schedule': crontab(hour=3, minute=30),
+    },
+}
+
+# Bookings (and their payments) are moved to the archive tables this many
+# days after check-out
+ARCHIVE_AFTER_DAYS = env.int('ARCHIVE_AFTER_DAYS', default=365)
+
+# Sent outbox messages are deleted this many days after dispatch; dead letters
+# are kept longer so failures can be investigated
+OUTBOX_RETENTION_DAYS = env.int('OUTBOX_RETENTION_DAYS', default=7)
+OUTBOX_DEAD_LETTER_RETENTION_DAYS = env.int('OUTBOX_DEAD_LETTER_RETENTION_DAYS', default=30)
 
 # Email Configuration
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
@@ -2,27 +2,31 @@
 
 from django.contrib import admin
 from django.urls import path, re_path, include
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 
-schema_view = get_schema_view(
-   openapi.Info(
-      title="ALX Travel API",
-      default_version='v1',
-      description="API documentation for ALX Travel Application",
-      terms_of_service="https://www.yourapp.com/terms/",
-      contact=openapi.Contact(email="contact@alxtravel.local"),
-      license=openapi.License(name="BSD License"),
-   ),
-   public=True,
-   permission_classes=[permissions.AllowAny],
-)
+
+def lazy_schema_view(renderer=None):
+    """
+    Build the drf_yasg schema view on first use, so drf_yasg is not imported
+    when a worker starts.
+    """
+    view = None
+
+    def schema(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            from .schema import CachedSchemaView
+            if renderer:
+                view = CachedSchemaView.with_ui(renderer, cache_timeout=0)
+            else:
+                view = CachedSchemaView.without_ui(cache_timeout=0)
+        return view(request, *args, **kwargs)
+
+    return schema
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('listings.urls')),
-    re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_view.without_ui(cache_timeout=0), name='schema-json'),
-    re_path(r'^swagger/$', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    re_path(r'^redoc/$', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
-]
\ No newline at end of file
+    re_path(r'^swagger(?P<format>\.json|\.yaml)$', lazy_schema_view(), name='schema-json'),
+    re_path(r'^swagger/$', lazy_schema_view('swagger'), name='schema-swagger-ui'),
+    re_path(r'^redoc/$', lazy_schema_view('redoc'), name='schema-redoc'),
+]
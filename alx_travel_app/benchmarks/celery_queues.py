@@ -0,0 +1,101 @@
+"""
+Benchmark: payment task latency behind a burst of email tasks.
+
+Runs an in-process Celery worker against the in-memory broker twice,
+once with every task in a single FIFO queue, and once with the queues and
+routes from settings. In each run a burst of slow email tasks is published,
+followed by one payment task, and the time until the payment task starts is
+reported. The routed run uses a single worker consuming all queues, which
+is the worst case; production runs a separate worker per queue.
+
+Usage (from the project root, with the usual .env in place):
+    python benchmarks/celery_queues.py [--emails 200] [--email-ms 10]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'alx_travel_app.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from celery import Celery  # noqa: E402
+from django.conf import settings  # noqa: E402
+from celery.contrib.testing.worker import start_worker  # noqa: E402
+
+
+def make_app(routed, email_seconds, payment_started):
+    app = Celery('bench', broker='memory://', set_as_current=False)
+    app.conf.update(
+        broker_transport_options={'polling_interval': 0.001},
+        task_ignore_result=True,
+        task_default_queue=settings.CELERY_TASK_DEFAULT_QUEUE,
+        task_queues=settings.CELERY_TASK_QUEUES,
+        task_routes=settings.CELERY_TASK_ROUTES if routed else {},
+        worker_prefetch_multiplier=settings.CELERY_WORKER_PREFETCH_MULTIPLIER,
+    )
+
+    # Task names follow CELERY_TASK_ROUTES, so they land on the same queues
+    # as the real notification and payment tasks.
+    @app.task(name='listings.tasks.send_bench_email')
+    def send_bench_email():
+        time.sleep(email_seconds)
+
+    @app.task(name='listings.tasks.bench_payment')
+    def bench_payment():
+        payment_started.set()
+
+    return app, send_bench_email, bench_payment
+
+
+def run(routed, emails, email_seconds):
+    payment_started = threading.Event()
+    app, send_bench_email, bench_payment = make_app(routed, email_seconds, payment_started)
+    queues = ['payments', 'notifications', 'default'] if routed else ['default']
+
+    with start_worker(app, pool='solo', perform_ping_check=False, queues=queues):
+        for _ in range(emails):
+            send_bench_email.delay()
+        start = time.perf_counter()
+        bench_payment.delay()
+        if not payment_started.wait(timeout=emails * email_seconds + 30):
+            raise RuntimeError('payment task never ran')
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--emails', type=int, default=200)
+    parser.add_argument('--email-ms', type=float, default=10.0)
+    parser.add_argument('--scenario', choices=['single', 'routed'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        print(run(args.scenario == 'routed', args.emails, args.email_ms / 1000))
+        return
+
+    # The in-memory broker keeps its state per process, so each scenario
+    # gets a fresh interpreter.
+    results = {}
+    for scenario in ('single', 'routed'):
+        output = subprocess.run(
+            [sys.executable, __file__, '--scenario', scenario,
+             '--emails', str(args.emails), '--email-ms', str(args.email_ms)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results[scenario] = float(output.split()[-1])
+
+    print(f'{args.emails} email tasks x {args.email_ms:.0f} ms, then 1 payment task')
+    print(f'single queue : payment started after {results["single"] * 1000:8.1f} ms')
+    print(f'routed queues: payment started after {results["routed"] * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: per-request latency with and without database connection reuse.
+
+Sends requests to GET /api/listings/ through the full Django request cycle
+(so connections are opened and released exactly as in production) once for
+each DB_POOL_MODE, each in a fresh interpreter, and reports median and p95
+latency. In 'pool' mode the pool statistics are printed as well.
+
+Needs a reachable, migrated PostgreSQL database configured through the usual
+DB_* variables, e.g. against a local server:
+    DB_HOST=localhost DB_SSLMODE=disable python benchmarks/db_pool.py [--requests 500]
+'pool' mode also needs `pip install "psycopg[binary,pool]"`.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+MODES = ['none', 'persistent', 'pool']
+
+
+def run(requests):
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'alx_travel_app.settings')
+    import django
+    django.setup()
+    from django.test import Client
+    from alx_travel_app.db import pool_stats
+
+    client = Client()
+    for _ in range(10):
+        client.get('/api/listings/')
+    pool_stats()  # reset the pool counters after warm-up
+
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get('/api/listings/')
+        timings.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.status_code
+
+    timings.sort()
+    print(statistics.median(timings), timings[int(len(timings) * 0.95) - 1])
+    stats = pool_stats()
+    if stats:
+        print(f"size={stats.get('pool_size', 0)}/{stats.get('pool_max', 0)} "
+              f"saturation={stats['saturation']:.0%} avg_wait_ms={stats['avg_wait_ms']:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run(args.requests)
+        return
+
+    print(f'{args.requests} x GET /api/listings/')
+    for mode in MODES:
+        result = subprocess.run(
+            [sys.executable, __file__, '--mode', mode, '--requests', str(args.requests)],
+            capture_output=True, text=True, env=dict(os.environ, DB_POOL_MODE=mode),
+        )
+        if result.returncode != 0:
+            print(f'{mode:>10}: failed\n{result.stderr.strip().splitlines()[-1]}')
+            continue
+        lines = result.stdout.splitlines()
+        median, p95 = (float(value) for value in lines[0].split())
+        print(f'{mode:>10}: median {median * 1000:7.2f} ms   p95 {p95 * 1000:7.2f} ms'
+              + (f'   {lines[1]}' if len(lines) > 1 else ''))
+
+
+if __name__ == '__main__':
+    main()
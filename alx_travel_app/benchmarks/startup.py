@@ -0,0 +1,84 @@
+"""
+Benchmark: web worker cold start and OpenAPI schema cost.
+
+Starts fresh interpreters that do what a web worker does before its first
+request (django.setup() and loading the URLconf) and reports the median wall
+time and which heavy modules got imported along the way. It then times one
+full schema generation against a cached schema lookup.
+
+Usage (from the project root, with the usual .env in place):
+    python benchmarks/startup.py [--runs 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ['drf_yasg.views', 'requests', 'celery']
+
+COLD_START = f"""
+import sys, time
+start = time.perf_counter()
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+import listings.views
+print(time.perf_counter() - start)
+print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))
+"""
+
+
+def cold_start(runs):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(PROJECT_DIR), os.environ.get('PYTHONPATH')])))
+    env.setdefault('DJANGO_SETTINGS_MODULE', 'alx_travel_app.settings')
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', COLD_START],
+            check=True, capture_output=True, text=True, cwd=PROJECT_DIR, env=env,
+        ).stdout.splitlines()
+        timings.append(float(output[0]))
+    loaded = output[1] if len(output) > 1 else ''
+    return statistics.median(timings), loaded
+
+
+def schema_cost():
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'alx_travel_app.settings')
+    import django
+    django.setup()
+    from django.conf import settings
+    from alx_travel_app.schema import build_schema, get_schema
+
+    start = time.perf_counter()
+    build_schema('json')
+    generate = time.perf_counter() - start
+
+    get_schema('json', settings.APP_VERSION)
+    start = time.perf_counter()
+    get_schema('json', settings.APP_VERSION)
+    cached = time.perf_counter() - start
+    return generate, cached
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    median, loaded = cold_start(args.runs)
+    generate, cached = schema_cost()
+
+    print(f'cold start (median of {args.runs}): {median * 1000:8.1f} ms')
+    print(f'heavy modules loaded at startup : {loaded or "none"}')
+    print(f'schema generation per request   : {generate * 1000:8.1f} ms')
+    print(f'schema from cache               : {cached * 1000:8.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
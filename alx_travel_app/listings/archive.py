@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ArchivedBooking, ArchivedPayment, Booking, Payment
+
+
+def _copy(instance, archive_model):
+    return archive_model(**{
+        field.attname: getattr(instance, field.attname)
+        for field in instance._meta.concrete_fields
+    })
+
+
+def archive_cutoff():
+    return timezone.now().date() - timedelta(days=settings.ARCHIVE_AFTER_DAYS)
+
+
+def archive_batch(cutoff, batch_size=500):
+    """
+    Move up to ``batch_size`` bookings that checked out before ``cutoff``,
+    together with their payments, to the archive tables.
+
+    Bookings with a pending payment stay live so a late Chapa callback can
+    still find them. Each batch is one transaction and claims its rows with
+    SKIP LOCKED, so it never blocks request handlers for long. Returns the
+    number of bookings moved.
+    """
+    with transaction.atomic():
+        ids = list(
+            Booking.objects
+            .select_for_update(skip_locked=True)
+            .filter(check_out_date__lt=cutoff)
+            .exclude(payments__status='pending')
+            .order_by('id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return 0
+
+        ArchivedBooking.objects.bulk_create(
+            _copy(booking, ArchivedBooking) for booking in Booking.objects.filter(id__in=ids)
+        )
+        ArchivedPayment.objects.bulk_create(
+            _copy(payment, ArchivedPayment) for payment in Payment.objects.filter(booking_id__in=ids)
+        )
+        # Deleting the bookings cascades to their payments
+        Booking.objects.filter(id__in=ids).delete()
+    return len(ids)
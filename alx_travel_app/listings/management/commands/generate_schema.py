@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from alx_travel_app.schema import SCHEMA_CODECS, build_schema, schema_path
+
+class Command(BaseCommand):
+    help = 'Build the OpenAPI schema for this code version so it is not generated per request'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--app-version', default=settings.APP_VERSION,
+                            help='Code version to build the schema for (defaults to APP_VERSION)')
+
+    def handle(self, *args, **options):
+        if not options['app_version']:
+            raise CommandError('Set APP_VERSION (or pass --app-version) to the code version being deployed')
+
+        for extension in SCHEMA_CODECS:
+            path = schema_path(extension, options['app_version'])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(build_schema(extension))
+            self.stdout.write(self.style.SUCCESS(f'Wrote {path}'))
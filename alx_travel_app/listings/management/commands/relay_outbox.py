@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from listings.outbox import relay_batch
+import time
+
+class Command(BaseCommand):
+    help = 'Relay pending outbox messages to the Celery broker'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100,
+                            help='Maximum number of messages sent per batch')
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help='Seconds to sleep when the outbox is empty')
+        parser.add_argument('--once', action='store_true',
+                            help='Drain the outbox once and exit')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        while True:
+            dispatched = relay_batch(batch_size)
+            if dispatched:
+                self.stdout.write(f'Relayed {dispatched} outbox message(s)')
+
+            if dispatched < batch_size:
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
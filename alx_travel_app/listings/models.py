@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 import uuid
 
 class Listing(models.Model):
@@ -24,6 +25,35 @@ class Listing(models.Model):
     def __str__(self):
         return self.title
 
+class ArchiveManager(models.Manager):
+    """
+    Manager for tables whose cold rows are moved to an archive model by
+    listings.archive. Plain queries only see the live table.
+    """
+    archive_model_name = None
+
+    def with_archived(self, *args, **kwargs):
+        """
+        Live and archived rows matching the given filters, returned as
+        instances of the live model. Filters go here because Django cannot
+        filter a UNION afterwards; ordering and slicing still work. Related
+        objects of archived rows resolve against the live tables, so follow
+        ``booking_id`` rather than ``booking`` on archived payments.
+        """
+        archive = self.model._meta.apps.get_model('listings', self.archive_model_name)
+        return self.filter(*args, **kwargs).union(
+            archive.objects.filter(*args, **kwargs), all=True
+        )
+
+
+class BookingManager(ArchiveManager):
+    archive_model_name = 'ArchivedBooking'
+
+
+class PaymentManager(ArchiveManager):
+    archive_model_name = 'ArchivedPayment'
+
+
 class Booking(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -31,8 +61,17 @@ class Booking(models.Model):
         ('cancelled', 'Cancelled'),
     ]
 
-    listing = models.ForeignKey(Listing, on_delete=models.CASCADE)
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    # Allowed status changes, applied by listings.transitions
+    ALLOWED_TRANSITIONS = {
+        'pending': {'confirmed', 'cancelled'},
+        'confirmed': {'cancelled'},
+        'cancelled': set(),
+    }
+
+    # No single-column FK indexes: booking_listing_dates_idx and
+    # booking_user_status_idx lead with these columns and serve the same lookups
+    listing = models.ForeignKey(Listing, on_delete=models.CASCADE, db_index=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
     check_in_date = models.DateField()
     check_out_date = models.DateField()
     guests_count = models.IntegerField()
@@ -41,6 +80,15 @@ class Booking(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = BookingManager()
+
+    class Meta:
+        indexes = [
+            # Availability checks: bookings of a listing overlapping a date range
+            models.Index(fields=['listing', 'check_in_date', 'check_out_date'], name='booking_listing_dates_idx'),
+            models.Index(fields=['user', 'status'], name='booking_user_status_idx'),
+        ]
+
     def __str__(self):
         return f"Booking for {self.listing.title} by {self.user.username}"
 
@@ -62,6 +110,15 @@ class Payment(models.Model):
         ('failed', 'Failed'),
     ]
 
+    # Allowed status changes, applied by listings.transitions. A payment that
+    # Chapa has confirmed can never go back to failed.
+    ALLOWED_TRANSITIONS = {
+        'pending': {'completed', 'verified', 'failed'},
+        'completed': {'verified'},
+        'verified': set(),
+        'failed': {'completed', 'verified'},
+    }
+
     booking = models.ForeignKey('Booking', on_delete=models.CASCADE, related_name='payments')
     reference = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
@@ -72,5 +129,77 @@ class Payment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = PaymentManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='payment_status_created_idx'),
+            # Only pending payments are looked up per booking (initiate_payment)
+            models.Index(fields=['booking'], condition=models.Q(status='pending'), name='payment_pending_booking_idx'),
+        ]
+
+    def __str__(self):
+        return f"Payment {self.reference} - {self.status}"
+
+# Archive tables for Booking and Payment history. Rows keep their ids and are
+# moved here by listings.archive once the stay is long over, so the live
+# tables (and their indexes) only hold current data. Fields must stay in the
+# same order as the live models for with_archived() to work.
+
+class ArchivedBooking(models.Model):
+    listing = models.ForeignKey(Listing, on_delete=models.CASCADE, related_name='archived_bookings')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_bookings')
+    check_in_date = models.DateField()
+    check_out_date = models.DateField()
+    guests_count = models.IntegerField()
+    total_price = models.DecimalField(max_digits=10, decimal_places=2)
+    status = models.CharField(max_length=20, choices=Booking.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Archived booking {self.id}"
+
+class ArchivedPayment(models.Model):
+    booking = models.ForeignKey(ArchivedBooking, on_delete=models.CASCADE, related_name='payments')
+    reference = models.UUIDField(unique=True)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    currency = models.CharField(max_length=3)
+    status = models.CharField(max_length=20, choices=Payment.PAYMENT_STATUS_CHOICES)
+    transaction_id = models.CharField(max_length=255, blank=True, null=True)
+    payment_url = models.URLField(max_length=500, blank=True, null=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Archived payment {self.reference} - {self.status}"
+
+class OutboxMessage(models.Model):
+    """
+    A Celery task call recorded in the same transaction as the state change
+    that triggers it. The ``relay_outbox`` command drains pending rows to the
+    broker, so request handlers never talk to Celery directly.
+    """
+    task_name = models.CharField(max_length=255)
+    kwargs = models.JSONField(default=dict)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    # When the relay may (re)try this message; pushed back on each failure
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    dispatched_at = models.DateTimeField(blank=True, null=True)
+    # Set when the relay gives up on the message (dead letter)
+    failed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            # The relay only ever reads messages that are neither sent nor dead
+            models.Index(
+                fields=['next_attempt_at'],
+                condition=models.Q(dispatched_at__isnull=True, failed_at__isnull=True),
+                name='outbox_due_idx',
+            ),
+        ]
+
     def __str__(self):
-        return f"Payment {self.reference} - {self.status}"
\ No newline at end of file
+        return f"Outbox {self.id} - {self.task_name}"
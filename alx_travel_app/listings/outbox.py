@@ -0,0 +1,111 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+# A claimed message is retried after this long if the relay dies mid-batch
+CLAIM_TIMEOUT = timedelta(seconds=60)
+# Failed publishes are retried with exponential backoff, then dead-lettered
+MAX_ATTEMPTS = 10
+RETRY_BACKOFF = timedelta(seconds=5)
+MAX_RETRY_BACKOFF = timedelta(hours=1)
+
+
+def enqueue(task, **kwargs):
+    """
+    Record a call to ``task`` in the outbox.
+
+    Call this inside the same ``transaction.atomic()`` block as the state
+    change it belongs to: the message is committed (or rolled back) together
+    with that change and is sent to the broker later by ``relay_batch``.
+    """
+    return OutboxMessage.objects.create(task_name=task.name, kwargs=kwargs)
+
+
+def _claim(batch_size):
+    """
+    Claim up to ``batch_size`` due messages by pushing their next attempt
+    past CLAIM_TIMEOUT, and commit straight away so no row lock is held while
+    talking to the broker. ``SKIP LOCKED`` keeps parallel relays apart.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            OutboxMessage.objects
+            .select_for_update(skip_locked=True)
+            .filter(dispatched_at__isnull=True, failed_at__isnull=True, next_attempt_at__lte=now)
+            .order_by('next_attempt_at')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        OutboxMessage.objects.filter(id__in=ids).update(
+            attempts=F('attempts') + 1, next_attempt_at=now + CLAIM_TIMEOUT
+        )
+    return list(OutboxMessage.objects.filter(id__in=ids).order_by('id'))
+
+
+def _fail(message, error):
+    message.last_error = error
+    if message.attempts >= MAX_ATTEMPTS:
+        message.failed_at = timezone.now()
+        logger.error(f"Giving up on outbox message {message.id} after {message.attempts} attempt(s): {error}")
+    else:
+        backoff = min(RETRY_BACKOFF * 2 ** (message.attempts - 1), MAX_RETRY_BACKOFF)
+        message.next_attempt_at = timezone.now() + backoff
+        logger.error(f"Failed to relay outbox message {message.id}: {error}")
+    message.save(update_fields=['last_error', 'failed_at', 'next_attempt_at'])
+
+
+def relay_batch(batch_size=100):
+    """
+    Send up to ``batch_size`` due outbox messages to Celery.
+
+    Messages are published by task name, so the relay doesn't need the task
+    modules imported and ``CELERY_TASK_ROUTES`` still applies. Messages that
+    fail to publish are retried with exponential backoff and dead-lettered
+    (``failed_at``) after MAX_ATTEMPTS, so they never block newer messages.
+    Returns the number of messages dispatched.
+    """
+    from alx_travel_app.celery import app
+
+    dispatched = 0
+    for message in _claim(batch_size):
+        try:
+            app.send_task(message.task_name, kwargs=message.kwargs, task_id=f"outbox-{message.id}")
+        except Exception as e:
+            _fail(message, str(e))
+            continue
+
+        message.dispatched_at = timezone.now()
+        message.last_error = ''
+        message.save(update_fields=['dispatched_at', 'last_error'])
+        dispatched += 1
+    return dispatched
+
+
+def purge_batch(batch_size=1000):
+    """
+    Delete up to ``batch_size`` messages dispatched more than
+    OUTBOX_RETENTION_DAYS ago, or dead-lettered more than
+    OUTBOX_DEAD_LETTER_RETENTION_DAYS ago, so the table doesn't grow without
+    bound. Old rows have the lowest ids, so walking the primary key finds them
+    without scanning recent ones. Returns the number of messages deleted.
+    """
+    now = timezone.now()
+    ids = list(
+        OutboxMessage.objects
+        .filter(
+            Q(dispatched_at__lt=now - timedelta(days=settings.OUTBOX_RETENTION_DAYS))
+            | Q(failed_at__lt=now - timedelta(days=settings.OUTBOX_DEAD_LETTER_RETENTION_DAYS))
+        )
+        .order_by('id')
+        .values_list('id', flat=True)[:batch_size]
+    )
+    OutboxMessage.objects.filter(id__in=ids).delete()
+    return len(ids)
@@ -6,19 +6,32 @@ class ListingSerializer(serializers.ModelSerializer):
         model = Listing
         fields = '__all__'
 
-class BookingSerializer(serializers.ModelSerializer):
+class StatusTransitionSerializer(serializers.ModelSerializer):
+    """
+    ``status`` is read-only: it only changes through ``listings.transitions``.
+    Updates write just the submitted columns, so a PUT/PATCH can't write a
+    stale status over a concurrent transition.
+    """
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=[*validated_data, 'updated_at'])
+        return instance
+
+class BookingSerializer(StatusTransitionSerializer):
     class Meta:
         model = Booking
         fields = '__all__'
+        read_only_fields = ['status']
 
 class ReviewSerializer(serializers.ModelSerializer):
     class Meta:
         model = Review
         fields = '__all__'
 
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(StatusTransitionSerializer):
     class Meta:
         model = Payment
         fields = ['id', 'booking', 'reference', 'amount', 'currency', 'status', 
                  'transaction_id', 'payment_url', 'created_at', 'updated_at']
-        read_only_fields = ['reference', 'transaction_id', 'payment_url']
\ No newline at end of file
+        read_only_fields = ['reference', 'status', 'transaction_id', 'payment_url']
\ No newline at end of file
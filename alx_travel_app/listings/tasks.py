@@ -1,8 +1,16 @@
 from celery import shared_task
 from django.core.mail import send_mail
 from django.conf import settings
+from .archive import archive_batch, archive_cutoff
+from .outbox import purge_batch
 
-@shared_task
+# Fire-and-forget: no result is stored. Sending is not idempotent, so a killed
+# worker process does not get the message redelivered (no reject_on_worker_lost).
+# acks_late still means the broker redelivers if a whole worker node disappears
+# mid-send, which can send the email twice; we prefer that to losing it.
+# The rate limit is per worker node, not cluster-wide: keep the number of
+# notifications workers x 60/m under the SMTP provider's quota.
+@shared_task(ignore_result=True, acks_late=True, rate_limit='60/m', soft_time_limit=30)
 def send_booking_confirmation_email(booking_id, user_email, listing_title):
     subject = f'Booking Confirmation - {listing_title}'
     message = (
@@ -20,3 +28,32 @@ def send_booking_confirmation_email(booking_id, user_email, listing_title):
     )
     
     return f"Confirmation email sent for booking {booking_id}"
+
+
+# Routed to the batch queue. Run by celery beat (see CELERY_BEAT_SCHEDULE).
+# Each batch is one transaction, so re-running after a lost worker is safe.
+@shared_task(ignore_result=True, acks_late=True, reject_on_worker_lost=True)
+def batch_archive_history(batch_size=500):
+    cutoff = archive_cutoff()
+    moved = 0
+    while True:
+        count = archive_batch(cutoff, batch_size)
+        moved += count
+        if count < batch_size:
+            break
+
+    return f"Archived {moved} bookings that checked out before {cutoff}"
+
+
+# Routed to the batch queue and run daily by celery beat, like the archive
+# job. Deleting already-sent messages is safe to repeat.
+@shared_task(ignore_result=True, acks_late=True, reject_on_worker_lost=True)
+def batch_purge_outbox(batch_size=1000):
+    purged = 0
+    while True:
+        count = purge_batch(batch_size)
+        purged += count
+        if count < batch_size:
+            break
+
+    return f"Purged {purged} outbox messages"
@@ -1,3 +1,473 @@
-from django.test import TestCase
+from django.conf import settings
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.core.management import call_command, CommandError
+from django.db import connection, connections
+from django.utils import timezone
+from django.contrib.auth.models import User
+from unittest import mock
+from datetime import date, timedelta
+import os
+import hmac
+import hashlib
+import io
+import logging
+import json
+import tempfile
+import subprocess
+import sys
+import queue
+from celery.contrib.testing.worker import start_worker
+from .models import Listing, Booking, Payment, OutboxMessage, ArchivedBooking, ArchivedPayment
+from .serializers import BookingSerializer
+from .tasks import send_booking_confirmation_email
+from . import outbox
+from .transitions import transition_payment, transition_booking
+from .views import confirm_booking
+from .archive import archive_batch
+from alx_travel_app.celery import app
 
-# Create your tests here.
+
+class BookingFixtures:
+    """A guest, a listing and one pending booking shared by the tests below."""
+
+    @classmethod
+    def create_fixtures(cls):
+        cls.user = User.objects.create_user(username='guest', email='guest@example.com')
+        cls.listing = Listing.objects.create(
+            title='Mountain Cottage', description='Cozy', property_type='cottage',
+            location='Aspen', price_per_night=100, bedrooms=1, bathrooms=1, max_guests=2
+        )
+        cls.booking = cls.create_booking(date(2025, 1, 1))
+
+    @classmethod
+    def create_booking(cls, check_in, payment_status=None):
+        booking = Booking.objects.create(
+            listing=cls.listing, user=cls.user, check_in_date=check_in,
+            check_out_date=check_in + timedelta(days=2), guests_count=1, total_price=200
+        )
+        if payment_status:
+            Payment.objects.create(booking=booking, amount=200, status=payment_status)
+        return booking
+
+
+class BookingTestCase(BookingFixtures, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_fixtures()
+
+
+class OutboxTests(BookingTestCase):
+    def test_relay_dispatches_pending_messages_once(self):
+        outbox.enqueue(send_booking_confirmation_email, booking_id=self.booking.id,
+                       user_email='guest@example.com', listing_title='Mountain Cottage')
+
+        with mock.patch.object(app, 'send_task') as send_task:
+            self.assertEqual(outbox.relay_batch(), 1)
+            self.assertEqual(outbox.relay_batch(), 0)
+
+        send_task.assert_called_once()
+        self.assertEqual(send_task.call_args.args[0], send_booking_confirmation_email.name)
+        self.assertEqual(send_task.call_args.kwargs['kwargs']['booking_id'], self.booking.id)
+        self.assertIsNotNone(OutboxMessage.objects.get().dispatched_at)
+
+    def enqueue(self):
+        return outbox.enqueue(send_booking_confirmation_email, booking_id=self.booking.id,
+                              user_email='guest@example.com', listing_title='Mountain Cottage')
+
+    def test_relay_backs_off_when_broker_is_down(self):
+        self.enqueue()
+
+        with mock.patch.object(app, 'send_task',
+                               side_effect=ConnectionError('broker unavailable')) as send_task:
+            self.assertEqual(outbox.relay_batch(), 0)
+            # Not due again yet
+            self.assertEqual(outbox.relay_batch(), 0)
+        send_task.assert_called_once()
+
+        message = OutboxMessage.objects.get()
+        self.assertIsNone(message.dispatched_at)
+        self.assertIsNone(message.failed_at)
+        self.assertEqual(message.attempts, 1)
+        self.assertGreater(message.next_attempt_at, timezone.now())
+        self.assertIn('broker unavailable', message.last_error)
+
+    def test_message_is_dead_lettered_after_max_attempts(self):
+        message = self.enqueue()
+        OutboxMessage.objects.filter(pk=message.pk).update(attempts=outbox.MAX_ATTEMPTS - 1)
+
+        with mock.patch.object(app, 'send_task', side_effect=ConnectionError('broker unavailable')):
+            outbox.relay_batch()
+
+        message.refresh_from_db()
+        self.assertIsNotNone(message.failed_at)
+
+    def test_failing_message_does_not_block_newer_messages(self):
+        failing = self.enqueue()
+        self.enqueue()
+
+        def send_task(name, kwargs, task_id):
+            if task_id == f'outbox-{failing.id}':
+                raise ConnectionError('broker unavailable')
+
+        with mock.patch.object(app, 'send_task', side_effect=send_task):
+            self.assertEqual(outbox.relay_batch(batch_size=1), 0)
+            self.assertEqual(outbox.relay_batch(batch_size=1), 1)
+
+        failing.refresh_from_db()
+        self.assertIsNone(failing.dispatched_at)
+        self.assertIsNone(failing.failed_at)
+
+    def test_purge_deletes_only_old_sent_and_dead_messages(self):
+        now = timezone.now()
+        pending, recent, old, dead, recent_dead = (self.enqueue() for _ in range(5))
+        OutboxMessage.objects.filter(pk=recent.pk).update(dispatched_at=now - timedelta(days=1))
+        OutboxMessage.objects.filter(pk=old.pk).update(dispatched_at=now - timedelta(days=8))
+        OutboxMessage.objects.filter(pk=dead.pk).update(failed_at=now - timedelta(days=31))
+        OutboxMessage.objects.filter(pk=recent_dead.pk).update(failed_at=now - timedelta(days=8))
+
+        self.assertEqual(outbox.purge_batch(batch_size=1), 1)
+        self.assertEqual(outbox.purge_batch(), 1)
+        self.assertEqual(outbox.purge_batch(), 0)
+
+        self.assertEqual(set(OutboxMessage.objects.values_list('id', flat=True)),
+                         {pending.id, recent.id, recent_dead.id})
+
+
+class RelayCommandTests(BookingFixtures, TransactionTestCase):
+    """
+    ``relay_outbox`` runs in its own process, where nothing has imported the
+    task modules; messages must still be sent, not dead-lettered.
+    """
+
+    def setUp(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest('the relay process needs a database it can share')
+        self.create_fixtures()
+
+    def test_relay_without_task_modules_loaded(self):
+        message = outbox.enqueue(send_booking_confirmation_email, booking_id=self.booking.id,
+                                 user_email='guest@example.com', listing_title='Mountain Cottage')
+        script = (
+            "import sys, django\n"
+            "from django.conf import settings\n"
+            f"settings.DATABASES['default']['NAME'] = {connection.settings_dict['NAME']!r}\n"
+            "django.setup()\n"
+            "from django.core.management import call_command\n"
+            "call_command('relay_outbox', once=True)\n"
+            "print('listings.tasks' in sys.modules)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', script], capture_output=True, text=True, cwd=settings.BASE_DIR,
+            env=dict(os.environ, CELERY_BROKER_URL='memory://', PYTHONPATH=os.pathsep.join(sys.path)),
+        )
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.splitlines()[-1], 'False')
+        message.refresh_from_db()
+        self.assertIsNotNone(message.dispatched_at)
+        self.assertIsNone(message.failed_at)
+
+
+class PaymentViewOutboxTests(BookingFixtures, TransactionTestCase):
+    """
+    The payment endpoints must answer normally and commit the confirmation
+    email to the outbox even when the broker is down.
+    """
+
+    def setUp(self):
+        self.create_fixtures()
+        self.payment = Payment.objects.create(booking=self.booking, amount=200)
+        task = app.tasks[send_booking_confirmation_email.name]
+        broker_down = ConnectionError('broker unavailable')
+        patchers = [
+            mock.patch.object(task, 'delay', side_effect=broker_down),
+            mock.patch.object(task, 'apply_async', side_effect=broker_down),
+        ]
+        self.delay, _ = [patcher.start() for patcher in patchers]
+        for patcher in patchers:
+            self.addCleanup(patcher.stop)
+
+    def assertEmailCommitted(self):
+        self.delay.assert_not_called()
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.task_name, send_booking_confirmation_email.name)
+        self.assertEqual(message.kwargs['booking_id'], self.booking.id)
+
+    def test_verify_payment(self):
+        chapa_response = mock.Mock(status_code=200)
+        chapa_response.json.return_value = {'status': 'success'}
+
+        with mock.patch('listings.views.requests.get', return_value=chapa_response):
+            response = self.client.post(f'/api/payments/{self.payment.id}/verify_payment/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEmailCommitted()
+
+    def post_webhook(self, payment_status):
+        body = json.dumps({'tx_ref': str(self.payment.reference), 'reference': 'chapa-1', 'status': payment_status})
+        signature = hmac.new(b'webhook-secret', body.encode(), hashlib.sha256).hexdigest()
+
+        with mock.patch.dict(os.environ, {'CHAPA_WEBHOOK_SECRET': 'webhook-secret'}):
+            return self.client.post('/api/webhook/chapa/', body, content_type='application/json',
+                                    HTTP_X_CHAPA_SIGNATURE=signature)
+
+    def test_chapa_webhook(self):
+        response = self.post_webhook('success')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEmailCommitted()
+
+    def test_webhook_after_verify_stores_reference_and_reports_real_status(self):
+        transition_payment(self.payment.pk, 'verified')
+
+        response = self.post_webhook('success')
+
+        self.assertEqual(response.json()['status'], 'verified')
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, 'verified')
+        self.assertEqual(self.payment.transaction_id, 'chapa-1')
+
+    def test_webhook_replaces_reference_from_initiate(self):
+        Payment.objects.filter(pk=self.payment.pk).update(transaction_id='initiated')
+
+        self.post_webhook('success')
+
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, 'completed')
+        self.assertEqual(self.payment.transaction_id, 'chapa-1')
+
+
+class WorkerConnectionTests(TransactionTestCase):
+    """
+    Consecutive tasks on one worker process must reuse its database
+    connection instead of reconnecting (or rebuilding the pool) per task.
+    """
+
+    def setUp(self):
+        broker = {'CELERY_BROKER_URL': app.conf.broker_url,
+                  'CELERY_BROKER_TRANSPORT_OPTIONS': app.conf.broker_transport_options}
+        app.conf.update(CELERY_BROKER_URL='memory://',
+                        CELERY_BROKER_TRANSPORT_OPTIONS={'polling_interval': 0.01})
+        self.addCleanup(app.conf.update, broker)
+
+    def test_consecutive_tasks_share_connection(self):
+        seen = queue.Queue()
+
+        @app.task(name='listings.tests.record_db_connection', shared=False)
+        def record_db_connection():
+            connection.ensure_connection()
+            seen.put(connection.connection)
+
+        @app.task(name='listings.tests.close_db_connections', shared=False)
+        def close_db_connections():
+            # The worker thread's connection would otherwise outlive the test
+            connections.close_all()
+            seen.put(None)
+
+        with start_worker(app, pool='solo', perform_ping_check=False):
+            record_db_connection.delay()
+            first = seen.get(timeout=10)
+            record_db_connection.delay()
+            second = seen.get(timeout=10)
+            close_db_connections.delay()
+            seen.get(timeout=10)
+
+        self.assertIs(first, second)
+
+
+class TransitionTests(BookingTestCase):
+    def setUp(self):
+        self.payment = Payment.objects.create(booking=self.booking, amount=200)
+
+    def test_verified_payment_is_not_overwritten_by_failed(self):
+        self.assertTrue(transition_payment(self.payment.pk, 'verified'))
+        self.assertFalse(transition_payment(self.payment.pk, 'failed'))
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, 'verified')
+
+    def test_transition_is_a_single_update(self):
+        with self.assertNumQueries(1):
+            self.assertTrue(transition_payment(self.payment.pk, 'completed', transaction_id='chapa-1'))
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.transaction_id, 'chapa-1')
+
+    def test_unknown_status_is_rejected(self):
+        with self.assertRaises(ValueError):
+            transition_booking(self.booking.pk, 'archived')
+
+    def test_booking_is_confirmed_and_email_queued_once(self):
+        confirm_booking(self.booking.pk)
+        confirm_booking(self.booking.pk)
+        self.booking.refresh_from_db()
+        self.assertEqual(self.booking.status, 'confirmed')
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+
+    def test_api_cannot_change_status(self):
+        transition_payment(self.payment.pk, 'verified')
+
+        response = self.client.patch(f'/api/payments/{self.payment.pk}/', {'status': 'pending'},
+                                     content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, 'verified')
+
+    def test_update_does_not_overwrite_concurrent_transition(self):
+        stale = Booking.objects.get(pk=self.booking.pk)
+        confirm_booking(self.booking.pk)
+
+        serializer = BookingSerializer(stale, data={'guests_count': 2}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        self.booking.refresh_from_db()
+        self.assertEqual(self.booking.status, 'confirmed')
+        self.assertEqual(self.booking.guests_count, 2)
+
+
+class QueryPlanTests(TestCase):
+    """
+    Runs EXPLAIN on the hot queries and fails unless each is served by the
+    index added for it. On PostgreSQL sequential scans are disabled for the
+    check, so the planner's choice doesn't depend on the small test tables.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        users = [User.objects.create_user(username=f'guest{i}') for i in range(5)]
+        listings = Listing.objects.bulk_create([
+            Listing(title=f'Listing {i}', description='', property_type='house', location='Aspen',
+                    price_per_night=100, bedrooms=1, bathrooms=1, max_guests=2)
+            for i in range(10)
+        ])
+        start = date(2025, 1, 1)
+        bookings = Booking.objects.bulk_create([
+            Booking(listing=listings[i % 10], user=users[i % 5], check_in_date=start + timedelta(days=i),
+                    check_out_date=start + timedelta(days=i + 3), guests_count=1, total_price=300,
+                    status=['pending', 'confirmed', 'cancelled'][i % 3])
+            for i in range(500)
+        ])
+        Payment.objects.bulk_create([
+            Payment(booking=booking, amount=300, status=['pending', 'verified', 'failed'][i % 3])
+            for i, booking in enumerate(bookings)
+        ])
+        OutboxMessage.objects.bulk_create([
+            OutboxMessage(task_name='listings.tasks.send_booking_confirmation_email',
+                          dispatched_at=timezone.now() if i % 10 else None)
+            for i in range(200)
+        ])
+        cls.listing, cls.user, cls.booking = listings[0], users[0], bookings[0]
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+    def assertUsesIndex(self, queryset, index_name):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        elif connection.vendor != 'sqlite':
+            self.skipTest(f'No plan check for {connection.vendor}')
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, plan)
+
+    def test_pending_payment_for_booking(self):
+        self.assertUsesIndex(Payment.objects.filter(booking=self.booking, status='pending'),
+                             'payment_pending_booking_idx')
+
+    def test_bookings_for_listing_in_date_range(self):
+        self.assertUsesIndex(Booking.objects.filter(
+            listing=self.listing, check_in_date__lt=date(2025, 3, 1), check_out_date__gt=date(2025, 2, 1)
+        ), 'booking_listing_dates_idx')
+
+    def test_bookings_for_user_by_status(self):
+        self.assertUsesIndex(Booking.objects.filter(user=self.user, status='confirmed'), 'booking_user_status_idx')
+
+    def test_payments_by_status_and_age(self):
+        self.assertUsesIndex(Payment.objects.filter(
+            status='pending', created_at__lt=timezone.now()
+        ).order_by('created_at'), 'payment_status_created_idx')
+
+    def test_pending_outbox_messages(self):
+        self.assertUsesIndex(OutboxMessage.objects.filter(
+            dispatched_at__isnull=True, failed_at__isnull=True, next_attempt_at__lte=timezone.now()
+        ).order_by('next_attempt_at'), 'outbox_due_idx')
+
+
+class PoolMetricsTests(TestCase):
+    def test_request_logs_pool_stats(self):
+        logger = logging.getLogger('alx_travel_app.db')
+        self.assertTrue(logger.handlers)
+        self.assertTrue(logger.isEnabledFor(logging.INFO))
+        stats = {'pool_size': 4, 'pool_max': 4, 'pool_available': 2, 'saturation': 0.5, 'avg_wait_ms': 1.0}
+
+        with mock.patch('alx_travel_app.db.pool_stats', return_value=stats), \
+                mock.patch('alx_travel_app.db._last_report', float('-inf')), \
+                self.assertLogs('alx_travel_app.db', 'INFO') as logs:
+            self.client.get('/api/listings/')
+
+        self.assertIn('saturation=50%', logs.output[0])
+
+
+class SchemaTests(TestCase):
+    def setUp(self):
+        from alx_travel_app.schema import get_schema
+        get_schema.cache_clear()
+        self.addCleanup(get_schema.cache_clear)
+
+    def test_spec_endpoints_serve_schema(self):
+        response = self.client.get('/swagger.json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('/payments/', json.loads(response.content)['paths'])
+        self.assertEqual(self.client.get('/swagger.yaml').status_code, 200)
+        self.assertEqual(self.client.get('/swagger/').status_code, 200)
+        self.assertEqual(self.client.get('/swagger/?format=openapi').status_code, 200)
+
+    def test_prebuilt_schema_is_served_for_its_version(self):
+        with tempfile.TemporaryDirectory() as schema_dir, \
+                override_settings(OPENAPI_SCHEMA_DIR=schema_dir, APP_VERSION='abc123'):
+            call_command('generate_schema', stdout=io.StringIO())
+            with open(f'{schema_dir}/schema-abc123.json', 'w') as f:
+                f.write('{"prebuilt": true}')
+
+            response = self.client.get('/swagger.json')
+            self.assertEqual(json.loads(response.content), {'prebuilt': True})
+
+    def test_prebuilt_schema_is_ignored_in_debug(self):
+        with tempfile.TemporaryDirectory() as schema_dir, \
+                override_settings(OPENAPI_SCHEMA_DIR=schema_dir, APP_VERSION='abc123', DEBUG=True):
+            with open(f'{schema_dir}/schema-abc123.json', 'w') as f:
+                f.write('{"prebuilt": true}')
+
+            response = self.client.get('/swagger.json')
+            self.assertIn('paths', json.loads(response.content))
+
+    def test_generate_schema_requires_app_version(self):
+        with override_settings(APP_VERSION=None), self.assertRaises(CommandError):
+            call_command('generate_schema', stdout=io.StringIO())
+
+
+class ArchiveTests(BookingTestCase):
+    def setUp(self):
+        self.old = self.create_booking(date(2020, 1, 1), 'verified')
+        self.old_unpaid = self.create_booking(date(2020, 2, 1), 'pending')
+        self.upcoming = self.create_booking(date(2030, 1, 1), 'verified')
+
+    def test_cold_bookings_and_payments_are_moved(self):
+        self.assertEqual(archive_batch(date(2025, 1, 1)), 1)
+
+        self.assertEqual(set(Booking.objects.values_list('id', flat=True)), {self.old_unpaid.id, self.booking.id, self.upcoming.id})
+        archived = ArchivedBooking.objects.get()
+        self.assertEqual(archived.id, self.old.id)
+        self.assertEqual(archived.created_at, self.old.created_at)
+        self.assertEqual(ArchivedPayment.objects.get().booking_id, self.old.id)
+        self.assertFalse(Payment.objects.filter(booking_id=self.old.id).exists())
+        self.assertEqual(archive_batch(date(2025, 1, 1)), 0)
+
+    def test_with_archived_includes_archive_only_when_asked(self):
+        archive_batch(date(2025, 1, 1))
+
+        self.assertEqual(Booking.objects.filter(user__username='guest').count(), 3)
+        bookings = Booking.objects.with_archived(user__username='guest').order_by('check_in_date')
+        self.assertEqual([b.id for b in bookings], [self.old.id, self.old_unpaid.id, self.booking.id, self.upcoming.id])
+        self.assertEqual(Payment.objects.with_archived(status='verified').count(), 2)
@@ -0,0 +1,37 @@
+from django.utils import timezone
+
+from .models import Booking, Payment
+
+
+def _transition(model, pk, to_status, **fields):
+    if to_status not in model.ALLOWED_TRANSITIONS:
+        raise ValueError(f"Unknown {model.__name__} status: {to_status}")
+
+    from_statuses = [
+        status for status, targets in model.ALLOWED_TRANSITIONS.items()
+        if to_status in targets
+    ]
+    updated = model.objects.filter(pk=pk, status__in=from_statuses).update(
+        status=to_status, updated_at=timezone.now(), **fields
+    )
+    return updated == 1
+
+
+def transition_payment(payment_id, to_status, **fields):
+    """
+    Move a payment to ``to_status`` if its current status allows it.
+
+    The check and the write are a single conditional UPDATE, so concurrent
+    callers (e.g. the verify endpoint and the Chapa webhook) cannot overwrite
+    each other's result and no row lock is taken. Extra ``fields`` are written
+    in the same statement. Returns True if this call made the change.
+    """
+    return _transition(Payment, payment_id, to_status, **fields)
+
+
+def transition_booking(booking_id, to_status, **fields):
+    """
+    Move a booking to ``to_status`` if its current status allows it.
+    Same semantics as ``transition_payment``.
+    """
+    return _transition(Booking, booking_id, to_status, **fields)
@@ -6,6 +6,10 @@ from rest_framework.decorators import api_view, action
 from .models import Listing, Booking, Payment
 from .serializers import ListingSerializer, BookingSerializer, PaymentSerializer
 from .tasks import send_booking_confirmation_email
+from . import outbox
+from .transitions import transition_payment, transition_booking
+from django.db import transaction
+from django.utils import timezone
 import requests
 import json
 from django.shortcuts import get_object_or_404
@@ -62,6 +66,26 @@ class BookingViewSet(viewsets.ModelViewSet):
         return payment_viewset.initiate_payment(request, pk=payment.pk)
 
 
+def confirm_booking(booking_id):
+    """
+    Confirm a booking and queue its confirmation email. Must run inside the
+    transaction that updated the payment. The email is only queued by the
+    call that actually confirms the booking, so duplicate verify/webhook
+    calls do not send it twice.
+    """
+    if not transition_booking(booking_id, 'confirmed'):
+        return
+
+    booking = Booking.objects.select_related('user', 'listing').get(pk=booking_id)
+    # The confirmation email is relayed to Celery by the outbox
+    outbox.enqueue(
+        send_booking_confirmation_email,
+        booking_id=booking.id,
+        user_email=booking.user.email,
+        listing_title=booking.listing.title
+    )
+
+
 @api_view(['GET'])
 def sample_api(request):
     return Response({"message": "Listings API is working"})
@@ -115,7 +139,8 @@ class PaymentViewSet(viewsets.ModelViewSet):
                     payment.transaction_id = transaction_id
                 if checkout_url:
                     payment.payment_url = checkout_url
-                payment.save()
+                # Only write these columns so a concurrent status change is not overwritten
+                payment.save(update_fields=['transaction_id', 'payment_url', 'updated_at'])
 
                 return Response({
                     'status': 'success',
@@ -158,32 +183,18 @@ class PaymentViewSet(viewsets.ModelViewSet):
             response_data = response.json()
 
             if response.status_code == 200 and response_data.get('status') == 'success':
-                # Update payment status to "verified" upon successful verification
-                payment.status = 'verified'
-                payment.save()
-
-                # Update the booking status
-                booking = payment.booking
-                booking.status = 'confirmed'
-                booking.save()
-
-                # Try to send confirmation email, but don't fail if Celery is unavailable
-                try:
-                    send_booking_confirmation_email.delay(
-                        booking_id=booking.id,
-                        user_email=booking.user.email,
-                        listing_title=booking.listing.title
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to queue confirmation email: {str(e)}")
+                with transaction.atomic():
+                    # Update payment status to "verified" upon successful verification
+                    transition_payment(payment.pk, 'verified')
+                    confirm_booking(payment.booking_id)
 
                 return Response({
                     'status': 'success',
                     'message': 'Payment verified successfully'
                 })
             else:
-                payment.status = 'failed'
-                payment.save()
+                # Has no effect if the webhook already completed the payment
+                transition_payment(payment.pk, 'failed')
                 return Response({
                     'status': 'error',
                     'message': 'Payment verification failed',
@@ -249,25 +260,22 @@ def chapa_webhook(request):
         return Response({'message': 'Payment not found'}, status=404)
 
     # Update payment details
-    if reference:
-        payment.transaction_id = reference
-    payment.status = 'completed' if payment_status == 'success' else 'failed'
-    payment.save()
-
-    if payment.status == 'completed':
-        booking = payment.booking
-        booking.status = 'confirmed'
-        booking.save()
-        
-        # Send confirmation email asynchronously
-        try:
-            send_booking_confirmation_email.delay(
-                booking_id=booking.id,
-                user_email=booking.user.email,
-                listing_title=booking.listing.title
-            )
-        except Exception as e:
-            logger.error(f"Failed to send confirmation email: {str(e)}")
+    new_status = 'completed' if payment_status == 'success' else 'failed'
+
+    # Chapa's reference is always stored, in the same UPDATE as the status
+    fields = {'transaction_id': reference} if reference else {}
+
+    with transaction.atomic():
+        if transition_payment(payment.pk, new_status, **fields):
+            payment.status = new_status
+            if new_status == 'completed':
+                confirm_booking(payment.booking_id)
+        else:
+            # Rejected (e.g. verify_payment already marked it verified): still
+            # keep the reference, and report the status the payment really has
+            if fields:
+                Payment.objects.filter(pk=payment.pk).update(updated_at=timezone.now(), **fields)
+            payment.status = Payment.objects.values_list('status', flat=True).get(pk=payment.pk)
 
     return Response({
         'message': 'Webhook processed successfully',